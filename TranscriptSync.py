@@ -8,9 +8,13 @@ import rumps
 import subprocess
 import os
 import re
+import functools
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 import webbrowser
+from PyObjCTools import AppHelper
 
 # Paths - use environment variables with fallbacks for portability
 # Set TRANSCRIPTSYNC_PROJECT_DIR and TRANSCRIPTSYNC_PODCASTS_DIR to override defaults
@@ -21,6 +25,123 @@ CONVERSION_SCRIPT = PROJECT_DIR / "transcriptsync_scheduled.sh"
 # Base podcasts folder - transcripts live alongside MP3s
 PODCASTS_BASE = os.environ.get("TRANSCRIPTSYNC_PODCASTS_DIR", "/Users/codyaustin/Documents/Katib/podcasts")
 
+# Log parsing pattern - compiled on the first menu click rather than at launch, then reused.
+# One alternation covers every line we care about, each anchored at the start of the
+# stripped line so .match() gives up at offset 0 instead of retrying every position:
+#   ts:   "[2025-01-01 09:30:00] Starting TranscriptSync scheduled run"
+#   file: "✓ Converted: Episode name (3/∞)"
+#   n:    "Converted: 3 files" / "Updated: 0 files" / "Skipped (already up to date): 7 files"
+@functools.lru_cache(maxsize=None)
+def _line_re():
+    return re.compile(
+        r'\[(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] Starting TranscriptSync'
+        r'|✓ (?:Converted|Updated): (?P<file>.+?)(?:\s+\(\d+/|$)'
+        r'|(?P<kind>Converted|Updated|Skipped[^:]*): (?P<n>\d+) files'
+    )
+
+
+# Runs are delimited by a line of 42 equals signs
+RUN_SEPARATOR = b"=" * 42
+_CHECK_MARK = "✓".encode('utf-8')
+MAX_RECENT_SYNCS = 10
+
+# The wake schedule rarely changes, so reuse pmset output for this long
+PMSET_CACHE_SECONDS = 60
+
+
+def _reverse_lines(path, block=65536):
+    """Yield the raw lines of a log file last-to-first, reading backwards from the end
+
+    Only as many blocks as the caller consumes are read, so stopping early
+    keeps the cost proportional to the recent runs rather than the whole log.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        pending = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + pending).split(b"\n")
+            # lines[0] may continue into the previous block; keep it for the next read
+            pending = lines[0]
+            yield from reversed(lines[1:])
+        yield pending
+
+
+def _iter_runs(lines):
+    """Group log lines into runs, yielding one parsed run dict at a time
+
+    A run is flushed at each separator line, so only the run being built is
+    held in memory. Runs without a start timestamp are dropped.
+    """
+    line_re = _line_re()
+    run = None
+    for raw in lines:
+        if RUN_SEPARATOR in raw:
+            if run and run['timestamp']:
+                yield run
+            run = None
+            continue
+
+        # Cheap substring gate on the raw bytes: only lines that can match
+        # are decoded, stripped and handed to the regex engine
+        if b"files" not in raw and _CHECK_MARK not in raw and b"Starting TranscriptSync" not in raw:
+            continue
+
+        line = raw.decode('utf-8', 'replace').strip()
+        match = line_re.match(line)
+        if not match:
+            continue
+        if run is None:
+            run = {'dt': None, 'timestamp': None, 'files': [], 'converted': 0, 'updated': 0, 'skipped': 0}
+        group = match.lastgroup
+
+        # Get timestamp from "Starting TranscriptSync scheduled run"
+        if group == 'ts':
+            # The pattern fixes the layout, so slice the fields
+            # directly rather than re-interpreting a strptime format
+            ts = match['ts']
+            try:
+                run['dt'] = datetime(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                                     int(ts[11:13]), int(ts[14:16]), int(ts[17:19]))
+                run['timestamp'] = run['dt'].strftime("%b %d, %I:%M %p")
+            except ValueError:
+                run['timestamp'] = ts
+                run['dt'] = datetime.min
+
+        # Get converted/updated files
+        elif group == 'file':
+            run['files'].append(match['file'])
+
+        # Get summary from "Converted: X files" format
+        elif group == 'n':
+            kind = match['kind']
+            if kind == 'Converted':
+                run['converted'] = int(match['n'])
+            elif kind == 'Updated':
+                run['updated'] = int(match['n'])
+            else:
+                run['skipped'] = int(match['n'])
+
+    if run and run['timestamp']:
+        yield run
+
+
+def _format_run(run, files):
+    """Render one parsed run as a menu entry"""
+    converted, updated = run['converted'], run['updated']
+    summary = f"({converted} new, {updated} updated, {run['skipped']} skipped)"
+    entry = f"\n📅 {run['timestamp']} {summary}"
+    if files:
+        entry += "\n   " + "\n   ".join(files[:5])
+        if len(files) > 5:
+            entry += f"\n   ... and {len(files) - 5} more"
+    elif converted == 0 and updated == 0:
+        entry += "\n   (no new files)"
+    return entry
+
 
 class TranscriptSyncApp(rumps.App):
     def __init__(self):
@@ -31,6 +152,13 @@ class TranscriptSyncApp(rumps.App):
             quit_button=None
         )
 
+        # Parsed log entries keyed by path: (size, mtime, [(datetime, entry), ...])
+        self._log_cache = {}
+        # Last pmset -g sched output: (monotonic time fetched, output)
+        self._pmset_cache = None
+        # Background episode-count scan, so slow disks don't stall the menu bar
+        self._counts_thread = None
+
         # Build menu
         self.menu = [
             rumps.MenuItem("View Recent Syncs", callback=self.show_log_window),
@@ -95,25 +223,48 @@ class TranscriptSyncApp(rumps.App):
         )
 
     def show_counts(self, _):
-        """Show episode counts per podcast - counts transcripts in podcast folders"""
+        """Show episode counts per podcast - the folder scan runs off the main thread"""
+        if self._counts_thread and self._counts_thread.is_alive():
+            return  # A scan is already running; its alert will appear when it finishes
+
+        self._counts_thread = threading.Thread(target=self._compute_counts, daemon=True)
+        self._counts_thread.start()
+
+    def _compute_counts(self):
+        """Count transcripts in podcast folders, then hand the alert back to the main thread"""
+        message = self._count_episodes()
+        AppHelper.callAfter(rumps.alert, title="Episode Counts", message=message, ok="Close")
+
+    def _count_episodes(self):
+        """Build the per-podcast transcript/episode count message"""
         counts = []
         total_txt = 0
         total_mp3 = 0
 
         try:
-            base = Path(PODCASTS_BASE)
-            if not base.exists():
-                rumps.alert(title="Episode Counts", message=f"Podcasts folder not found:\n{PODCASTS_BASE}", ok="Close")
-                return
-
-            # Find all podcast subfolders
-            for folder in sorted(base.iterdir()):
-                if not folder.is_dir() or folder.name.startswith('.'):
-                    continue
-
-                # Count .txt and .mp3 files in each podcast folder
-                txt_count = len([f for f in folder.iterdir() if f.suffix.lower() == '.txt'])
-                mp3_count = len([f for f in folder.iterdir() if f.suffix.lower() == '.mp3'])
+            # Find all podcast subfolders (DirEntry caches the type, so no extra stat per entry).
+            # A missing base folder surfaces here rather than costing a separate exists() probe.
+            try:
+                with os.scandir(PODCASTS_BASE) as it:
+                    folders = sorted((e for e in it if e.is_dir() and not e.name.startswith('.')),
+                                     key=lambda e: e.name)
+            except FileNotFoundError:
+                return f"Podcasts folder not found:\n{PODCASTS_BASE}"
+
+            for folder in folders:
+                # Count .txt and .mp3 files in one pass over each podcast folder
+                txt_count = 0
+                mp3_count = 0
+                with os.scandir(folder.path) as it:
+                    for entry in it:
+                        name = entry.name.lower()
+                        # Same test as Path.suffix: a bare ".txt" has no suffix
+                        if len(name) <= 4:
+                            continue
+                        if name.endswith('.txt'):
+                            txt_count += 1
+                        elif name.endswith('.mp3'):
+                            mp3_count += 1
 
                 total_txt += txt_count
                 total_mp3 += mp3_count
@@ -133,17 +284,22 @@ class TranscriptSyncApp(rumps.App):
         except Exception as e:
             message = f"Error reading folders: {e}"
 
-        rumps.alert(title="Episode Counts", message=message, ok="Close")
+        return message
 
     def show_next_run(self, _):
         """Show next scheduled wake/run time"""
         try:
-            result = subprocess.run(
-                ["pmset", "-g", "sched"],
-                capture_output=True,
-                text=True
-            )
-            output = result.stdout.strip()
+            now = time.monotonic()
+            if self._pmset_cache and now - self._pmset_cache[0] < PMSET_CACHE_SECONDS:
+                output = self._pmset_cache[1]
+            else:
+                result = subprocess.run(
+                    ["pmset", "-g", "sched"],
+                    capture_output=True,
+                    text=True
+                )
+                output = result.stdout.strip()
+                self._pmset_cache = (now, output)
 
             if output:
                 message = output
@@ -184,82 +340,46 @@ class TranscriptSyncApp(rumps.App):
 
         entries = []  # List of (datetime, entry_string) tuples
         try:
-            # Get recent log files (last 5 days)
+            # Get recent log files (last 5 days), newest first - date-stamped names sort by day
             log_files = sorted(LOG_DIR.glob("sync_*.log"), reverse=True)[:5]
 
             for log_file in log_files:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Split by run separators (42 equals signs)
-                runs = content.split("=" * 42)
-
-                for run in runs:
-                    if not run.strip():
-                        continue
-
-                    lines = run.strip().split('\n')
-                    dt = None
-                    timestamp = None
-                    files = []
-                    converted = 0
-                    updated = 0
-                    skipped = 0
-
-                    for line in lines:
-                        line = line.strip()
-
-                        # Get timestamp from "Starting TranscriptSync scheduled run"
-                        if "Starting TranscriptSync" in line:
-                            match = re.match(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
-                            if match:
-                                try:
-                                    dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
-                                    timestamp = dt.strftime("%b %d, %I:%M %p")
-                                except ValueError:
-                                    timestamp = match.group(1)
-                                    dt = datetime.min
-
-                        # Get converted/updated files
-                        elif "✓ Converted:" in line or "✓ Updated:" in line:
-                            # Extract file name
-                            match = re.search(r'✓ (?:Converted|Updated): (.+?)(?:\s+\(\d+/|$)', line)
-                            if match:
-                                files.append(match.group(1))
-
-                        # Get summary from "Converted: X files" format
-                        elif "Converted:" in line and "files" in line:
-                            match = re.search(r'Converted: (\d+) files', line)
-                            if match:
-                                converted = int(match.group(1))
-                        elif "Updated:" in line and "files" in line:
-                            match = re.search(r'Updated: (\d+) files', line)
-                            if match:
-                                updated = int(match.group(1))
-                        elif "Skipped" in line and "files" in line:
-                            match = re.search(r'Skipped.*?: (\d+) files', line)
-                            if match:
-                                skipped = int(match.group(1))
-
-                    if timestamp and dt:
-                        summary = f"({converted} new, {updated} updated, {skipped} skipped)"
-                        entry = f"\n📅 {timestamp} {summary}"
-                        if files:
-                            entry += "\n   " + "\n   ".join(files[:5])
-                            if len(files) > 5:
-                                entry += f"\n   ... and {len(files) - 5} more"
-                        elif converted == 0 and updated == 0:
-                            entry += "\n   (no new files)"
-                        entries.append((dt, entry))
+                # Files and the runs within them are visited newest-first,
+                # so once enough entries are collected the rest are older
+                if len(entries) >= MAX_RECENT_SYNCS:
+                    break
+
+                # Reuse the parse of any log that hasn't changed since last click
+                st = log_file.stat()
+                key = str(log_file)
+                cached = self._log_cache.get(key)
+                if cached and cached[0] == st.st_size and cached[1] == st.st_mtime:
+                    file_entries = cached[2]
+                else:
+                    file_entries = self._parse_log_file(log_file)
+                    self._log_cache[key] = (st.st_size, st.st_mtime, file_entries)
+                entries.extend(file_entries)
 
         except Exception as e:
             return [f"Error reading log: {e}"]
 
-        # Sort by datetime descending (newest first), return just the entry strings
-        entries.sort(key=lambda x: x[0], reverse=True)
-        result = [entry for _, entry in entries[:10]]
+        # Already newest-first; return just the entry strings
+        result = [entry for _, entry in entries[:MAX_RECENT_SYNCS]]
         return result if result else ["No sync entries found in log."]
 
+    def _parse_log_file(self, log_file):
+        """Parse the most recent runs of one log file into (datetime, entry_string) tuples"""
+        entries = []
+
+        # Walk runs newest-first; older runs in this file can't make the cut
+        for run in _iter_runs(_reverse_lines(log_file)):
+            # Lines arrived last-to-first, so restore the file order for display
+            entries.append((run['dt'], _format_run(run, run['files'][::-1])))
+            if len(entries) >= MAX_RECENT_SYNCS:
+                break
+
+        return entries
+
 
 if __name__ == "__main__":
     TranscriptSyncApp().run()
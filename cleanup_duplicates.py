@@ -5,15 +5,38 @@ from a Google Drive folder.
 """
 
 import os
-import re
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httplib2
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 
+# Drive's per-user quota: 1000 requests per 100 seconds, each call in a batch counting separately
+DRIVE_QUOTA_REQUESTS = 1000
+DRIVE_QUOTA_WINDOW = 100
+# Drive accepts at most 100 calls per batch request
+DELETE_BATCH_SIZE = 100
+# Seconds between batches, so a full batch never outruns the quota
+DELETE_BATCH_PAUSE = DELETE_BATCH_SIZE * DRIVE_QUOTA_WINDOW / DRIVE_QUOTA_REQUESTS
+# Concurrent deletes used when the batch endpoint rejects a request
+DELETE_WORKERS = 16
+
+# Folder name lookups are remembered here between runs
+FOLDER_ID_CACHE_FILE = os.path.expanduser('~/.cache/transcriptsync/folder_ids.json')
+
+# Seconds before a stalled Drive request gives up
+DRIVE_HTTP_TIMEOUT = 60
+
+_thread_local = threading.local()
+
 
 def setup_gdrive_service():
-    """Set up and return Google Drive service"""
+    """Set up and return Google Drive service and its credentials"""
     # Note: Full drive scope required because duplicates like "file (1)" are created
     # by Google Drive itself, not by our app, so drive.file scope won't work
     SCOPES = ['https://www.googleapis.com/auth/drive']
@@ -41,77 +64,159 @@ def setup_gdrive_service():
         with open(token_file, 'w') as token:
             token.write(creds.to_json())
 
-    return build('drive', 'v3', credentials=creds)
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+    return build('drive', 'v3', http=http), creds
+
+
+def _thread_http(creds):
+    """Each delete thread gets its own connection"""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+        _thread_local.http = http
+    return http
+
+
+def delete_files_parallel(service, creds, files, callback, max_workers=DELETE_WORKERS):
+    """Delete files with a pool of threads, reporting each result like a batch callback"""
+    # Requests are spaced out to the same quota the batches are paced to
+    interval = DRIVE_QUOTA_WINDOW / DRIVE_QUOTA_REQUESTS
+    next_slot = time.monotonic()
+    slot_lock = threading.Lock()
+
+    def delete_one(f):
+        nonlocal next_slot
+        with slot_lock:
+            now = time.monotonic()
+            slot = max(now, next_slot)
+            next_slot = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+        service.files().delete(fileId=f['id']).execute(http=_thread_http(creds))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(delete_one, f): f for f in files}
+        for future in as_completed(futures):
+            f = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                callback(f['id'], None, e)
+            else:
+                callback(f['id'], None, None)
+
+
+def load_folder_id_cache():
+    """Load the folder name -> ID cache written by earlier runs"""
+    try:
+        with open(FOLDER_ID_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_folder_id_cache(cache):
+    """Persist the folder name -> ID cache for later runs"""
+    try:
+        os.makedirs(os.path.dirname(FOLDER_ID_CACHE_FILE), exist_ok=True)
+        with open(FOLDER_ID_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"⚠ Could not save folder cache: {e}")
+
+
+def _q(value):
+    """Escape a string for use inside a quoted Drive query literal"""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
 
 
 def find_folder_by_name(service, folder_name, parent_id=None):
     """Find a folder by name, optionally within a parent folder"""
-    # Escape single quotes for the API query
-    escaped_name = folder_name.replace("'", "\\'")
-    query = f"name='{escaped_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
+    cache_key = f"{parent_id or ''}/{folder_name}"
+    cache = load_folder_id_cache()
+
+    # A cached ID only needs a cheap get to confirm it wasn't renamed or trashed
+    folder_id = cache.get(cache_key)
+    if folder_id:
+        try:
+            folder = service.files().get(fileId=folder_id, fields="id, name, trashed").execute()
+            if folder.get('name') == folder_name and not folder.get('trashed'):
+                return {'id': folder['id'], 'name': folder['name']}
+        except Exception:
+            pass
+
+    query = f"name='{_q(folder_name)}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
     if parent_id:
         query += f" and '{parent_id}' in parents"
 
-    results = service.files().list(q=query, fields="files(id, name)").execute()
+    results = service.files().list(q=query, fields="files(id, name)", pageSize=1000).execute()
     files = results.get('files', [])
-    return files[0] if files else None
+    if not files:
+        return None
 
+    cache[cache_key] = files[0]['id']
+    save_folder_id_cache(cache)
+    return files[0]
 
-def get_all_files_in_folder(service, folder_id):
-    """Get all files in a folder (handles pagination)"""
-    all_files = []
+
+def iter_all_files_in_folder(service, folder_id):
+    """Yield all Google Docs in a folder, one page at a time (handles pagination)"""
     page_token = None
 
+    # Let Drive filter to Docs server-side and return only the fields we read
+    query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.document' and trashed=false"
     while True:
-        query = f"'{folder_id}' in parents and trashed=false"
         results = service.files().list(
             q=query,
-            fields="nextPageToken, files(id, name, mimeType)",
+            fields="nextPageToken, files(id, name)",
             pageSize=1000,
             pageToken=page_token
         ).execute()
 
-        all_files.extend(results.get('files', []))
+        yield from results.get('files', [])
         page_token = results.get('nextPageToken')
 
         if not page_token:
             break
 
-    return all_files
 
+def is_duplicate_name(name):
+    """Check for a "<name> (N)" copy suffix (Google Docs don't have extensions in API)"""
+    # A single endswith() rejects nearly every name; the rest need one rfind and
+    # a slice of just the digits - no regex, and no copy of the base name
+    if not name.endswith(')'):
+        return False
+    i = name.rfind(' (')
+    return i > 0 and name[i + 2:-1].isdecimal()
 
-def cleanup_duplicates(service, folder_id, dry_run=True, debug=False):
-    """Find and delete duplicate files with (1), (2), etc. suffixes"""
 
-    # Pattern to match files with (1), (2), etc. at the end (Google Docs don't have extensions in API)
-    duplicate_pattern = re.compile(r'^(.+) \((\d+)\)$')
+def cleanup_duplicates(service, creds, folder_id, dry_run=True, debug=False, use_batch=True):
+    """Find and delete duplicate files with (1), (2), etc. suffixes"""
 
     print(f"Scanning folder for duplicates...")
-    files = get_all_files_in_folder(service, folder_id)
-    print(f"Found {len(files)} total files")
-
     if debug:
         print("\nSample file names from API:")
-        for f in files[:15]:
-            print(f"  '{f['name']}'")
-        print()
 
-    # Separate originals and duplicates
-    originals = {}
+    # Separate originals and duplicates page by page, without holding the whole listing
+    total = 0
+    originals = 0
     duplicates = []
 
-    for f in files:
+    for f in iter_all_files_in_folder(service, folder_id):
+        total += 1
         name = f['name']
-        match = duplicate_pattern.match(name)
+        if debug and total <= 15:
+            print(f"  '{name}'")
 
-        if match:
+        if is_duplicate_name(name):
             duplicates.append(f)
         else:
-            # Store original by base name (without extension)
-            base_name = name.replace('.gdoc', '')
-            originals[base_name] = f
+            originals += 1
 
-    print(f"Found {len(originals)} original files")
+    if debug:
+        print()
+    print(f"Found {total} total files")
+    print(f"Found {originals} original files")
     print(f"Found {len(duplicates)} duplicate files to remove")
 
     if not duplicates:
@@ -134,15 +239,45 @@ def cleanup_duplicates(service, folder_id, dry_run=True, debug=False):
     deleted = 0
     errors = 0
 
-    for f in duplicates:
-        try:
-            service.files().delete(fileId=f['id']).execute()
+    names = {f['id']: f['name'] for f in duplicates}
+
+    def on_delete(request_id, response, exception):
+        nonlocal deleted, errors
+        if exception is not None:
+            print(f"  Error deleting {names.get(request_id, request_id)}: {exception}")
+            errors += 1
+        else:
             deleted += 1
-            if deleted % 50 == 0:
+
+    if not use_batch:
+        # One pool for the whole run, so connections and quota pacing carry across files
+        def on_parallel_delete(request_id, response, exception):
+            on_delete(request_id, response, exception)
+            done = deleted + errors
+            if done % DELETE_BATCH_SIZE == 0 or done == len(duplicates):
                 print(f"  Deleted {deleted}/{len(duplicates)}...")
+
+        delete_files_parallel(service, creds, duplicates, on_parallel_delete)
+        print(f"\nDone! Deleted {deleted} files, {errors} errors")
+        return duplicates
+
+    # Send deletes through the batch endpoint - one HTTP round trip per chunk instead of per file
+    for start in range(0, len(duplicates), DELETE_BATCH_SIZE):
+        chunk = duplicates[start:start + DELETE_BATCH_SIZE]
+        if start:
+            # Every call in a batch still counts against the per-user quota
+            time.sleep(DELETE_BATCH_PAUSE)
+
+        batch = service.new_batch_http_request(callback=on_delete)
+        for f in chunk:
+            batch.add(service.files().delete(fileId=f['id']), request_id=f['id'])
+        try:
+            batch.execute()
         except Exception as e:
-            print(f"  Error deleting {f['name']}: {e}")
-            errors += 1
+            # Batch endpoint unavailable - the deletes are I/O-bound, so overlap them on threads
+            print(f"  Batch request failed ({e}), deleting {len(chunk)} files in parallel instead")
+            delete_files_parallel(service, creds, chunk, on_delete)
+        print(f"  Deleted {deleted}/{len(duplicates)}...")
 
     print(f"\nDone! Deleted {deleted} files, {errors} errors")
     return duplicates
@@ -158,6 +293,8 @@ def main():
                         help='Actually delete files (default is dry run)')
     parser.add_argument('--debug', action='store_true',
                         help='Show debug info about file names')
+    parser.add_argument('--no-batch', action='store_true',
+                        help='Delete with parallel requests instead of the batch endpoint')
 
     args = parser.parse_args()
 
@@ -165,7 +302,7 @@ def main():
         parser.error("Either --folder-id or --folder-name is required")
 
     print("Connecting to Google Drive...")
-    service = setup_gdrive_service()
+    service, creds = setup_gdrive_service()
     print("Connected!")
 
     # Find the folder
@@ -182,7 +319,8 @@ def main():
         print(f"Found folder: {folder['name']} (ID: {folder_id})")
 
     # Clean up duplicates
-    cleanup_duplicates(service, folder_id, dry_run=not args.delete, debug=args.debug)
+    cleanup_duplicates(service, creds, folder_id, dry_run=not args.delete, debug=args.debug,
+                       use_batch=not args.no_batch)
 
 
 if __name__ == '__main__':
@@ -4,16 +4,29 @@ Automatically updates Claude project context by monitoring .txt files.
 Supports local directories and optional Google Drive folder monitoring.
 """
 
+import codecs
+import io
 import os
+import re
 import sys
 import json
+import hashlib
 import time
+import shutil
+import subprocess
+import tempfile
+import queue
+import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import List, Optional, Set
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
     from watchdog.events import FileSystemEventHandler, FileModifiedEvent, FileCreatedEvent
 except ImportError:
     print("watchdog not installed. Install with: pip install watchdog")
@@ -25,37 +38,216 @@ try:
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload
-    import io
+    from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
     GDRIVE_AVAILABLE = True
 except ImportError:
     GDRIVE_AVAILABLE = False
 
+# Drive downloads are written in 1 MB chunks rather than the client's 100 KB default
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Concurrent Drive downloads when several cached files are stale
+DOWNLOAD_WORKERS = 8
+
+# Parent folders OR-ed into each query when listing the conversion target's subtree
+SUBTREE_QUERY_PARENTS = 50
+# Concurrent uploads in convert_txt_to_gdocs, and the write rate they share
+UPLOAD_WORKERS = 8
+UPLOAD_RATE = 10  # requests per second
+# Uploads above this size use a resumable session, sent in 8 MiB chunks (16 MiB past 80 MB)
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+LARGE_UPLOAD_THRESHOLD = 80 * 1024 * 1024
+LARGE_UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# CLAUDE.md is written through a 1 MB buffer; files above CACHE_MAX_FILE_SIZE aren't kept
+# in the content cache but copied into it COPY_CHUNK_SIZE characters at a time. Each such
+# file is read twice per regeneration: a UTF-8 check first, so a bad one adds no partial text
+WRITE_BUFFER_SIZE = 1024 * 1024
+CACHE_MAX_FILE_SIZE = 1024 * 1024
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Concurrent directory walks when several monitored dirs are configured
+SCAN_WORKERS = 8
+
+# Directories never searched for context files (VCS metadata, virtualenvs, caches)
+SKIP_DIRS = frozenset({'.git', '.hg', '.svn', '__pycache__', 'node_modules', 'venv', '.venv', '.tox'})
+
+# Filesystems whose changes native watchers (inotify/FSEvents) don't see; FUSE types match by substring
+NETWORK_FS_TYPES = frozenset({'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'afpfs', 'webdav', 'sshfs', '9p'})
+
+# appProperties key holding the SHA-256 of the .txt a converted doc was made from
+SOURCE_HASH_PROPERTY = 'src_sha256'
+
+# Folder-name cleanup patterns, applied to every path component during conversion
+_TXT_SUFFIX = re.compile(r'\s+TXT$')
+_NUM_SUFFIX = re.compile(r'\s+\(\d+\)$')
+
+# Mount table parsing: a `mount` output line, and the octal escapes /proc/mounts uses for
+# space, tab, newline and backslash
+_MOUNT_LINE = re.compile(r'.+? on (.+) \(([^,)]+)')
+_MOUNT_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+# Socket timeout (seconds) for Drive connections
+DRIVE_HTTP_TIMEOUT = 60
+
+_thread_local = threading.local()
+
+
+def _thread_http(creds):
+    """Return an authorized Http for the calling thread (httplib2.Http is not thread-safe)"""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+        _thread_local.http = http
+    return http
+
+
+def _iter_txt_files(root, skip_dirs=SKIP_DIRS):
+    """Yield every .txt file (any case) under root, using scandir's cached entry types"""
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        yield from _iter_txt_files(entry.path, skip_dirs)
+                elif entry.name.lower().endswith('.txt') and entry.is_file():
+                    yield Path(entry.path)
+    except (PermissionError, FileNotFoundError):
+        pass
+
+
+def _list_mounts() -> List[Tuple[str, str]]:
+    """Return (mount_point, fs_type) pairs from /proc/mounts, or from `mount` on macOS"""
+    mounts = []
+    try:
+        with open('/proc/mounts', 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mount_point = _MOUNT_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+                    mounts.append((mount_point, fields[2]))
+        return mounts
+    except OSError:
+        pass
+    try:
+        output = subprocess.run(['mount'], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return mounts
+    for line in output.splitlines():
+        # "/dev/disk3s1 on /System/Volumes/Data (apfs, local, journaled)"
+        match = _MOUNT_LINE.match(line)
+        if match:
+            mounts.append((match.group(1), match.group(2)))
+    return mounts
+
+
+def _is_network_path(path: str, mounts: List[Tuple[str, str]]) -> bool:
+    """Check whether path lives on a network or FUSE filesystem, going by its deepest mount point"""
+    real = os.path.join(os.path.realpath(path), '')
+    best, best_type = '', ''
+    for mount_point, fs_type in mounts:
+        prefix = os.path.join(mount_point, '')
+        if real.startswith(prefix) and len(prefix) > len(best):
+            best, best_type = prefix, fs_type
+    return best_type in NETWORK_FS_TYPES or 'fuse' in best_type
+
+
+def _relative_to(path: Path, base: Path) -> Path:
+    """path relative to base, or path unchanged when it lies outside base"""
+    try:
+        return path.relative_to(base)
+    except ValueError:
+        return path
+
+
+class _RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart, across all threads"""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _HashingWriter:
+    """Text stream wrapper that hashes what passes through, except text sent to write_volatile()"""
+    
+    def __init__(self, out):
+        self._out = out
+        self._hash = hashlib.blake2b(digest_size=16)
+    
+    def write(self, text: str):
+        self._hash.update(text.encode('utf-8'))
+        return self._out.write(text)
+    
+    def write_volatile(self, text: str):
+        return self._out.write(text)
+    
+    def digest(self) -> bytes:
+        return self._hash.digest()
+
 
 class TextFileHandler(FileSystemEventHandler):
     """Handles file system events for .txt files"""
     
-    def __init__(self, context_file: str, monitored_dirs: List[str], gdrive_service=None, gdrive_folder_id=None):
+    def __init__(self, context_file: str, monitored_dirs: List[str], gdrive_service=None, gdrive_folder_id=None, gdrive_creds=None):
         self.context_file = context_file
         self.monitored_dirs = [Path(d) for d in monitored_dirs]
+        # Path prefixes for should_process, in both the as-given and symlink-resolved forms
+        prefixes = set()
+        for d in monitored_dirs:
+            prefixes.add(os.path.join(os.path.abspath(d), ''))
+            prefixes.add(os.path.join(os.path.realpath(d), ''))
+        self._dir_prefixes = tuple(prefixes)
+        # Paths in CLAUDE.md are shown relative to the directory the watcher started in
+        self._cwd = Path.cwd()
         self.gdrive_service = gdrive_service
+        self.gdrive_creds = gdrive_creds
         self.gdrive_folder_id = gdrive_folder_id
         self.debounce_seconds = 2
-        self.pending_files: Set[str] = set()
-        self.last_update = 0
+        # A steady stream of events still flushes this long after the first one
+        self.max_latency_seconds = 5
+        # Changed paths from watchdog, drained and debounced by a single worker thread
+        self._events: queue.Queue = queue.Queue()
+        # Keeps the worker and the Drive poll in main() from regenerating CLAUDE.md at the same time
+        self._update_lock = threading.Lock()
+        # Drive listing kept between polls and patched from the Changes API
+        self._gdrive_items: Optional[Dict[str, dict]] = None
+        # path -> (mtime_ns, size, content), so unchanged files aren't re-read each update
+        self._file_cache: Dict[Path, tuple] = {}
+        # Hash of the last CLAUDE.md written, ignoring its timestamp line
+        self._last_output_digest: Optional[bytes] = None
+        self._gdrive_page_token: Optional[str] = None
+        # Set when poll_gdrive has just applied the deltas, so the next update doesn't fetch them again
+        self._gdrive_fresh = False
+        self._worker: Optional[threading.Thread] = None
+    
+    def start_worker(self):
+        """Start the thread that turns queued events into updates (only needed when watching)"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
         
     def should_process(self, path: Path) -> bool:
         """Check if file should be processed"""
         if not path.suffix.lower() == '.txt':
             return False
-        # Check if file is in monitored directories
-        for monitored_dir in self.monitored_dirs:
-            try:
-                path.resolve().relative_to(monitored_dir.resolve())
-                return True
-            except ValueError:
-                continue
-        return False
+        # Check if file is in monitored directories (string prefix test, no filesystem access).
+        # The observer watches absolute paths, so event paths only need normalising.
+        p = os.path.normpath(path)
+        if not os.path.isabs(p):
+            p = os.path.abspath(p)
+        return p.startswith(self._dir_prefixes)
     
     def on_modified(self, event):
         """Handle file modification"""
@@ -72,38 +264,75 @@ class TextFileHandler(FileSystemEventHandler):
                 self.schedule_update(path)
     
     def schedule_update(self, path: Path):
-        """Schedule an update after debounce period"""
-        self.pending_files.add(str(path))
-        current_time = time.time()
-        if current_time - self.last_update > self.debounce_seconds:
-            self.update_context()
+        """Hand a changed path to the worker; the observer thread never waits on an update"""
+        self._events.put(str(path))
     
-    def update_context(self):
-        """Update the CLAUDE.md context file"""
-        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Detected changes, updating context...")
-        
-        all_txt_files = self.find_all_txt_files()
-        
-        # Generate CLAUDE.md content
-        content = self.generate_claude_md(all_txt_files)
-        
-        # Write to CLAUDE.md
-        with open(self.context_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"✓ Updated {self.context_file} with {len(all_txt_files)} .txt files")
-        self.pending_files.clear()
-        self.last_update = time.time()
+    def _worker_loop(self):
+        """Collect events until they've been quiet for the debounce period, then update once"""
+        while True:
+            # A set, so repeated modify/create events for one path coalesce
+            pending = {self._events.get()}
+            # A steady stream of events still flushes max_latency_seconds after the first one
+            deadline = time.monotonic() + self.max_latency_seconds
+            while True:
+                timeout = min(self.debounce_seconds, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    pending.add(self._events.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.update_context(pending)
+            except Exception as e:
+                print(f"⚠ Error updating context: {e}")
+    
+    def update_context(self, changed: Optional[Set[str]] = None):
+        """Update the CLAUDE.md context file, re-reading the files in changed regardless of mtime"""
+        with self._update_lock:
+            print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Detected changes, updating context...")
+            
+            all_txt_files = self.find_all_txt_files()
+            
+            # Drop cached content for deleted files and for files an event reported as changed
+            if self._file_cache:
+                live = set(all_txt_files)
+                changed_abs = {os.path.abspath(p) for p in changed or ()}
+                for cached in list(self._file_cache):
+                    if cached not in live or (changed_abs and os.path.abspath(cached) in changed_abs):
+                        del self._file_cache[cached]
+            
+            # Stream the content into a temp file and rename it over CLAUDE.md so readers never see a partial file
+            tmp_file = self.context_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                out = _HashingWriter(f)
+                self.write_claude_md(all_txt_files, out)
+            
+            # Leave CLAUDE.md (and its mtime) alone when only the timestamp would change
+            digest = out.digest()
+            if digest == self._last_output_digest and os.path.exists(self.context_file):
+                os.remove(tmp_file)
+                print(f"✓ {self.context_file} already up to date ({len(all_txt_files)} .txt files)")
+                return
+            os.replace(tmp_file, self.context_file)
+            self._last_output_digest = digest
+            
+            print(f"✓ Updated {self.context_file} with {len(all_txt_files)} .txt files")
     
     def find_all_txt_files(self) -> List[Path]:
         """Find all .txt files in monitored directories"""
         txt_files = []
         
-        # Find local .txt files
-        for monitored_dir in self.monitored_dirs:
-            if monitored_dir.exists():
-                txt_files.extend(monitored_dir.rglob('*.txt'))
-                txt_files.extend(monitored_dir.rglob('*.TXT'))
+        # Find local .txt files - independent roots are walked side by side, which
+        # overlaps the metadata round trips on slow or networked filesystems
+        roots = [d for d in self.monitored_dirs if d.exists()]
+        if len(roots) > 1:
+            with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(roots))) as executor:
+                for found in executor.map(lambda root: list(_iter_txt_files(root)), roots):
+                    txt_files.extend(found)
+        else:
+            for root in roots:
+                txt_files.extend(_iter_txt_files(root))
         
         # Find Google Drive .txt files if configured
         if self.gdrive_service and self.gdrive_folder_id:
@@ -121,31 +350,114 @@ class TextFileHandler(FileSystemEventHandler):
         
         txt_files = []
         try:
-            # List files in the folder
-            query = f"'{self.gdrive_folder_id}' in parents and mimeType='text/plain' and trashed=false"
-            results = self.gdrive_service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime)"
-            ).execute()
-            
-            items = results.get('files', [])
-            for item in items:
-                # Download to temp location and reference it
-                local_cache_dir = Path('.gdrive_cache')
-                local_cache_dir.mkdir(exist_ok=True)
+            # Full listing once, then only the deltas since the previous poll
+            if self._gdrive_items is None:
+                self._gdrive_items = self.list_gdrive_txt_files()
+            elif not self._gdrive_fresh:
+                self.apply_gdrive_changes()
+            self._gdrive_fresh = False
+
+            # Download to temp location and reference it
+            local_cache_dir = Path('.gdrive_cache')
+            local_cache_dir.mkdir(exist_ok=True)
+            # Drive allows several files with one name; they share a cache file, so keep the newest
+            newest: Dict[Path, dict] = {}
+            for item in self._gdrive_items.values():
                 cache_file = local_cache_dir / item['name']
-                
+                if cache_file not in newest or item['modifiedTime'] > newest[cache_file]['modifiedTime']:
+                    newest[cache_file] = item
+            
+            stale = []
+            for cache_file, item in newest.items():
                 # Download if not cached or if remote is newer
                 if not cache_file.exists() or self.is_gdrive_newer(item, cache_file):
-                    self.download_gdrive_file(item['id'], cache_file)
+                    stale.append((item['id'], cache_file))
                 
                 txt_files.append(cache_file)
+            
+            # Downloads are network-bound, so overlap them on a few threads
+            if stale:
+                with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(stale))) as executor:
+                    list(executor.map(lambda job: self.download_gdrive_file(*job), stale))
                 
         except Exception as e:
             print(f"⚠ Error fetching Google Drive files: {e}")
+            # Start over with a full listing on the next poll
+            self._gdrive_items = None
         
         return txt_files
     
+    def poll_gdrive(self) -> bool:
+        """Check Drive for changes since the last poll, True if CLAUDE.md needs regenerating"""
+        # The worker thread reads the same listing and connection inside update_context
+        with self._update_lock:
+            if self._gdrive_items is None:
+                return True
+            try:
+                changed = self.apply_gdrive_changes()
+            except Exception as e:
+                print(f"⚠ Error checking Google Drive for changes: {e}")
+                self._gdrive_items = None
+                return True
+            self._gdrive_fresh = changed
+            return changed
+    
+    def list_gdrive_txt_files(self) -> Dict[str, dict]:
+        """List .txt files in the Drive folder and start tracking changes from this point"""
+        # Take the change token before listing so edits made during the listing aren't lost
+        response = self.gdrive_service.changes().getStartPageToken().execute()
+        self._gdrive_page_token = response['startPageToken']
+
+        query = f"'{self.gdrive_folder_id}' in parents and mimeType='text/plain' and trashed=false"
+        items = {}
+        page_token = None
+        while True:
+            results = self.gdrive_service.files().list(
+                q=query,
+                pageSize=1000,
+                pageToken=page_token,
+                fields="nextPageToken, files(id, name, modifiedTime)"
+            ).execute()
+            for item in results.get('files', []):
+                items[item['id']] = item
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return items
+    
+    def apply_gdrive_changes(self) -> bool:
+        """Patch the cached Drive listing with changes since the last poll, True if any touched it"""
+        changed = False
+        page_token = self._gdrive_page_token
+        while page_token:
+            response = self.gdrive_service.changes().list(
+                pageToken=page_token,
+                pageSize=1000,
+                fields="nextPageToken, newStartPageToken, "
+                       "changes(fileId, removed, file(id, name, mimeType, modifiedTime, parents, trashed))"
+            ).execute()
+
+            for change in response.get('changes', []):
+                file = change.get('file') or {}
+                in_folder = (
+                    not change.get('removed')
+                    and not file.get('trashed')
+                    and file.get('mimeType') == 'text/plain'
+                    and self.gdrive_folder_id in file.get('parents', [])
+                )
+                if in_folder:
+                    self._gdrive_items[change['fileId']] = {
+                        'id': file['id'], 'name': file['name'], 'modifiedTime': file['modifiedTime']
+                    }
+                    changed = True
+                elif self._gdrive_items.pop(change['fileId'], None) is not None:
+                    changed = True
+
+            if 'newStartPageToken' in response:
+                self._gdrive_page_token = response['newStartPageToken']
+            page_token = response.get('nextPageToken')
+
+        return changed
+    
     def is_gdrive_newer(self, gdrive_item: dict, local_file: Path) -> bool:
         """Check if Google Drive file is newer than local cache"""
         if not local_file.exists():
@@ -153,7 +465,8 @@ class TextFileHandler(FileSystemEventHandler):
         
         try:
             gdrive_time = datetime.fromisoformat(gdrive_item['modifiedTime'].replace('Z', '+00:00'))
-            local_time = datetime.fromtimestamp(local_file.stat().st_mtime)
+            # Local mtime as UTC - comparing against the naive local time raised TypeError
+            local_time = datetime.fromtimestamp(local_file.stat().st_mtime, tz=timezone.utc)
             return gdrive_time > local_time
         except (ValueError, KeyError, OSError) as e:
             print(f"⚠ Could not compare file timestamps: {e}")
@@ -161,94 +474,105 @@ class TextFileHandler(FileSystemEventHandler):
     
     def download_gdrive_file(self, file_id: str, dest_path: Path):
         """Download a file from Google Drive"""
+        # Stream to a side file of its own and swap it in when complete, so a failed
+        # download never leaves a truncated file that looks newer than Drive
+        part_path = None
         try:
             request = self.gdrive_service.files().get_media(fileId=file_id)
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            # Write to file
-            with open(dest_path, 'wb') as f:
-                f.write(fh.getvalue())
+            # May run on a download worker; give it that thread's own connection
+            request.http = _thread_http(self.gdrive_creds)
+            with tempfile.NamedTemporaryFile(dir=dest_path.parent, prefix=dest_path.name + '.',
+                                             suffix='.part', delete=False) as fh:
+                part_path = fh.name
+                downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+                done = False
+                while not done:
+                    status, done = downloader.next_chunk()
+            os.replace(part_path, dest_path)
         except Exception as e:
             print(f"⚠ Error downloading {file_id}: {e}")
+            if part_path:
+                try:
+                    os.unlink(part_path)
+                except OSError:
+                    pass
     
-    def generate_claude_md(self, txt_files: List[Path]) -> str:
-        """Generate CLAUDE.md content with references to all .txt files"""
-        lines = [
-            "# Claude Project Context",
-            "",
-            f"*Auto-generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
-            "",
-            "## Context Files",
-            "",
-            "The following .txt files are automatically included in the project context:",
-            ""
-        ]
+    def write_txt_file(self, txt_file: Path, out):
+        """Copy a file's content to out, from the cache when its mtime and size are unchanged"""
+        st = os.stat(txt_file)
+        if st.st_size > CACHE_MAX_FILE_SIZE:
+            # Too big to keep in memory - stream it through instead. Decode it once first, so
+            # an undecodable file raises before any of it is written, as a whole read would
+            self._file_cache.pop(txt_file, None)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            with open(txt_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+                    decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+            with open(txt_file, 'r', encoding='utf-8') as f:
+                shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+            return
+        cached = self._file_cache.get(txt_file)
+        if not (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+            with open(txt_file, 'r', encoding='utf-8') as f:
+                cached = (st.st_mtime_ns, st.st_size, f.read())
+            self._file_cache[txt_file] = cached
+        out.write(cached[2])
+    
+    def write_claude_md(self, txt_files: List[Path], out):
+        """Write CLAUDE.md content with references to all .txt files to the text stream out"""
+        # Each piece starts with the newline that ends the previous one. The timestamp goes
+        # through write_volatile when out has one, so it doesn't count as a content change
+        write_volatile = getattr(out, 'write_volatile', out.write)
+        out.write("# Claude Project Context\n\n")
+        write_volatile(f"*Auto-generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        out.write(
+            "\n"
+            "## Context Files\n"
+            "\n"
+            "The following .txt files are automatically included in the project context:\n"
+        )
+        
+        cwd = self._cwd
+        # Each file's display path is needed in both sections, so work it out once
+        rel_paths = {txt_file: _relative_to(txt_file, cwd) for txt_file in txt_files}
         
         # Group files by directory
-        by_dir = {}
+        by_dir: Dict[Path, List[Path]] = defaultdict(list)
         for txt_file in txt_files:
-            parent = txt_file.parent
-            if parent not in by_dir:
-                by_dir[parent] = []
-            by_dir[parent].append(txt_file)
+            by_dir[txt_file.parent].append(txt_file)
         
         # Add file references using @ syntax for Claude
         for parent_dir in sorted(by_dir.keys(), key=lambda p: str(p)):
-            rel_dir = parent_dir.relative_to(Path.cwd()) if parent_dir.is_relative_to(Path.cwd()) else parent_dir
-            lines.append(f"### {rel_dir}")
+            rel_dir = _relative_to(parent_dir, cwd)
+            out.write(f"\n### {rel_dir}")
             for txt_file in sorted(by_dir[parent_dir], key=lambda p: p.name):
-                rel_path = txt_file.relative_to(Path.cwd()) if txt_file.is_relative_to(Path.cwd()) else txt_file
-                lines.append(f"@{rel_path}")
-                lines.append("")
+                out.write(f"\n@{rel_paths[txt_file]}\n")
         
         # Add actual content sections
-        lines.extend([
-            "",
-            "---",
-            "",
-            "## File Contents",
-            "",
-            "The following sections contain the actual content of the context files:",
-            ""
-        ])
+        out.write(
+            "\n"
+            "\n---\n"
+            "\n## File Contents\n"
+            "\nThe following sections contain the actual content of the context files:\n"
+        )
         
         for txt_file in txt_files:
-            rel_path = txt_file.relative_to(Path.cwd()) if txt_file.is_relative_to(Path.cwd()) else txt_file
-            lines.extend([
-                f"### {txt_file.name}",
-                f"*Source: {rel_path}*",
-                "",
-                "```",
-            ])
+            out.write(f"\n### {txt_file.name}\n*Source: {rel_paths[txt_file]}*\n\n```\n")
             
             try:
-                with open(txt_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines.append(content)
+                self.write_txt_file(txt_file, out)
             except Exception as e:
-                lines.append(f"[Error reading file: {e}]")
+                out.write(f"[Error reading file: {e}]")
             
-            lines.extend([
-                "```",
-                "",
-                "---",
-                ""
-            ])
-        
-        return "\n".join(lines)
-
+            out.write("\n```\n\n---\n")
 
-def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', token_file: str = 'gdrive_token.json', write_access: bool = False) -> Optional[object]:
-    """Set up and return Google Drive service"""
-    import pickle  # Only imported here for backwards compatibility migration
 
+def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', token_file: str = 'gdrive_token.json', write_access: bool = False) -> Tuple[Optional[object], Optional[object]]:
+    """Set up and return Google Drive service, with the credentials it was built from"""
     if not GDRIVE_AVAILABLE:
         print("⚠ Google Drive libraries not installed. Install with: pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
-        return None
+        return None, None
 
     # Use file scope for write access (allows creating/updating files)
     if write_access:
@@ -257,6 +581,9 @@ def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', toke
         SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
     creds = None
+    # Older configs named the pickle itself; store JSON next to it and migrate from the pickle
+    if token_file.endswith('.pickle'):
+        token_file = token_file[:-len('.pickle')] + '.json'
     pickle_file = token_file.replace('.json', '.pickle')
 
     # Load existing token from JSON file (preferred)
@@ -268,6 +595,7 @@ def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', toke
             creds = None
     # Fall back to pickle file for backwards compatibility
     elif os.path.exists(pickle_file):
+        import pickle  # Only imported when there's a legacy token to migrate
         try:
             with open(pickle_file, 'rb') as f:
                 creds = pickle.load(f)
@@ -297,7 +625,7 @@ def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', toke
                 print("  2. Create a project and enable Google Drive API")
                 print("  3. Create OAuth 2.0 credentials")
                 print("  4. Download credentials as 'gdrive_credentials.json'")
-                return None
+                return None, None
 
             flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
             creds = flow.run_local_server(port=0)
@@ -306,17 +634,17 @@ def setup_gdrive_service(credentials_file: str = 'gdrive_credentials.json', toke
         with open(token_file, 'w') as token:
             token.write(creds.to_json())
 
-    return build('drive', 'v3', credentials=creds)
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
+    return build('drive', 'v3', http=http), creds
 
 
-def convert_txt_to_gdocs(gdrive_service, source_dirs: List[str], target_folder_id: str, preserve_structure: bool = True, limit: int = 0) -> dict:
+def convert_txt_to_gdocs(gdrive_service, gdrive_creds, source_dirs: List[str], target_folder_id: str, preserve_structure: bool = True, limit: int = 0) -> dict:
     """
     Convert .txt files to Google Docs in the specified Google Drive folder.
     If preserve_structure=True, recreates the subfolder structure in Google Drive.
     If limit > 0, only convert that many files (useful for batch processing).
     Returns a dict with conversion results.
     """
-    import tempfile
 
     if not gdrive_service:
         return {"error": "Google Drive service not available"}
@@ -324,37 +652,59 @@ def convert_txt_to_gdocs(gdrive_service, source_dirs: List[str], target_folder_i
     results = {"converted": [], "updated": [], "skipped": [], "errors": [], "limit_reached": False}
     converted_count = 0  # Track how many files we've actually converted/updated
 
-    # Cache for folder IDs (folder_path -> gdrive_folder_id)
+    # Cache for folder IDs ("parent_id/folder_name" -> gdrive_folder_id) and the Docs already
+    # in each folder (folder_id -> {doc_name: doc}), both filled by fetch_target_subtree()
     folder_cache = {"": target_folder_id}
+    existing_by_folder: Dict[str, dict] = defaultdict(dict)
+
+    def fetch_target_subtree():
+        """List every folder and Doc under the target folder, querying a whole tree level at a time"""
+        seen = {target_folder_id}
+        level = [target_folder_id]
+        while level:
+            next_level = []
+            for i in range(0, len(level), SUBTREE_QUERY_PARENTS):
+                in_parents = ' or '.join(f"'{parent_id}' in parents" for parent_id in level[i:i + SUBTREE_QUERY_PARENTS])
+                query = (f"({in_parents}) and (mimeType='application/vnd.google-apps.folder' "
+                         f"or mimeType='application/vnd.google-apps.document') and trashed=false")
+                page_token = None
+                while True:
+                    response = gdrive_service.files().list(
+                        q=query,
+                        pageSize=1000,
+                        pageToken=page_token,
+                        fields="nextPageToken, files(id, name, mimeType, parents, modifiedTime, appProperties)"
+                    ).execute()
+                    for item in response.get('files', []):
+                        is_folder = item['mimeType'] == 'application/vnd.google-apps.folder'
+                        for parent_id in item.get('parents', []):
+                            if is_folder:
+                                folder_cache.setdefault(f"{parent_id}/{item['name']}", item['id'])
+                            else:
+                                existing_by_folder[parent_id][item['name']] = item
+                        if is_folder and item['id'] not in seen:
+                            seen.add(item['id'])
+                            next_level.append(item['id'])
+                    page_token = response.get('nextPageToken')
+                    if not page_token:
+                        break
+            level = next_level
 
     def get_or_create_folder(folder_name: str, parent_id: str) -> str:
-        """Get existing folder or create new one in Google Drive"""
+        """Get existing folder from the cache or create new one in Google Drive"""
         cache_key = f"{parent_id}/{folder_name}"
         if cache_key in folder_cache:
             return folder_cache[cache_key]
 
-        # Search for existing folder
-        try:
-            # Escape apostrophes in folder name for the query
-            escaped_name = folder_name.replace("'", "\\'")
-            query = f"'{parent_id}' in parents and name='{escaped_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            response = gdrive_service.files().list(q=query, fields="files(id, name)").execute()
-            files = response.get('files', [])
-            if files:
-                folder_id = files[0]['id']
-                folder_cache[cache_key] = folder_id
-                return folder_id
-        except Exception as e:
-            print(f"⚠ Error searching for folder {folder_name}: {e}")
-
-        # Create new folder
+        # Not in the fetched subtree, so create new folder
         try:
             file_metadata = {
                 'name': folder_name,
                 'mimeType': 'application/vnd.google-apps.folder',
                 'parents': [parent_id]
             }
-            folder = gdrive_service.files().create(body=file_metadata, fields='id').execute()
+            write_limiter.wait()
+            folder = gdrive_service.files().create(body=file_metadata, fields='id').execute(http=_thread_http(gdrive_creds))
             folder_id = folder['id']
             folder_cache[cache_key] = folder_id
             print(f"📁 Created folder: {folder_name}")
@@ -365,17 +715,16 @@ def convert_txt_to_gdocs(gdrive_service, source_dirs: List[str], target_folder_i
 
     def clean_folder_name(name: str) -> str:
         """Clean up folder names by removing TXT suffix and (1) etc."""
-        import re
         # Remove " TXT" suffix
-        name = re.sub(r'\s+TXT$', '', name)
+        name = _TXT_SUFFIX.sub('', name)
         # Remove " (1)" or similar numbered suffixes
-        name = re.sub(r'\s+\(\d+\)$', '', name)
+        name = _NUM_SUFFIX.sub('', name)
         return name.strip()
 
-    def get_target_folder_id(txt_file: Path, source_root: Path) -> str:
-        """Determine the target folder ID based on file's relative path"""
+    def get_target_folder_path(txt_file: Path, source_root: Path) -> Tuple[str, ...]:
+        """Determine the target folder, as names below the target folder, from the file's relative path"""
         if not preserve_structure:
-            return target_folder_id
+            return ()
 
         try:
             rel_path = txt_file.parent.relative_to(source_root)
@@ -385,32 +734,163 @@ def convert_txt_to_gdocs(gdrive_service, source_dirs: List[str], target_folder_i
                 source_folder_name = clean_folder_name(source_root.name)
                 # Only create subfolder if source folder has a meaningful name
                 if source_folder_name and source_folder_name.lower() not in ['transcripts', '.']:
-                    return get_or_create_folder(source_folder_name, target_folder_id)
-                return target_folder_id
-
-            # Navigate/create folder hierarchy
-            current_folder_id = target_folder_id
-            for part in rel_path.parts:
-                clean_name = clean_folder_name(part)
-                current_folder_id = get_or_create_folder(clean_name, current_folder_id)
-            return current_folder_id
+                    return (source_folder_name,)
+                return ()
+
+            return tuple(clean_folder_name(part) for part in rel_path.parts)
         except ValueError:
-            return target_folder_id
+            return ()
+
+    def resolve_folder(folder_path: Tuple[str, ...], create: bool) -> Optional[str]:
+        """Follow folder_path down from the target folder; missing folders are created, or give None"""
+        current_folder_id = target_folder_id
+        for name in folder_path:
+            folder_id = folder_cache.get(f"{current_folder_id}/{name}")
+            if folder_id is None:
+                if not create:
+                    return None
+                folder_id = get_or_create_folder(name, current_folder_id)
+            current_folder_id = folder_id
+        return current_folder_id
 
-    def get_existing_docs_in_folder(folder_id: str) -> dict:
-        """Get existing Google Docs in a folder"""
-        existing = {}
+    def upload_one(txt_file: Path, folder_path: Tuple[str, ...]):
+        """Convert one .txt file into a Google Doc, recording the outcome in results"""
+        nonlocal converted_count, reserved_count
+        # Check limit before processing each file
+        if limit > 0 and converted_count >= limit:
+            results["limit_reached"] = True
+            return
+        http = _thread_http(gdrive_creds)
         try:
-            query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.document' and trashed=false"
-            response = gdrive_service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime)"
-            ).execute()
-            for doc in response.get('files', []):
-                existing[doc['name']] = doc
+            doc_name = txt_file.stem
+            # A folder that doesn't exist yet can't hold the doc either
+            folder_id = resolve_folder(folder_path, create=False)
+            existing_docs = existing_by_folder[folder_id] if folder_id else {}
+            existing_doc = existing_docs.get(doc_name)
+
+            # Check if doc already exists and skip if so (no update needed)
+            if existing_doc:
+                # Check if local file is newer than Google Doc
+                try:
+                    gdrive_time = datetime.fromisoformat(existing_doc['modifiedTime'].replace('Z', '+00:00'))
+                    # Get local file mtime as UTC for proper comparison
+                    local_time = datetime.fromtimestamp(txt_file.stat().st_mtime, tz=timezone.utc)
+                    if local_time <= gdrive_time:
+                        with results_lock:
+                            results["skipped"].append({"name": doc_name, "reason": "already up to date"})
+                        return
+                except (ValueError, KeyError, OSError) as e:
+                    print(f"⚠ Could not compare timestamps for {doc_name}, will update: {e}")
+
+            # Claim a slot under the limit before any write, so parallel uploads can't overshoot it
+            with results_lock:
+                if limit > 0 and reserved_count >= limit:
+                    results["limit_reached"] = True
+                    return
+                reserved_count += 1
+
+            try:
+                # Folders are only created once a file is certain to be uploaded into them
+                if folder_id is None:
+                    with folder_lock:
+                        folder_id = resolve_folder(folder_path, create=True)
+                    existing_docs = existing_by_folder[folder_id]
+
+                # Read the .txt file content
+                with open(txt_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                data = content.encode('utf-8')
+
+                # A newer mtime with the same bytes (touch, git checkout) needs no upload
+                content_hash = hashlib.sha256(data).hexdigest()
+                if existing_doc and existing_doc.get('appProperties', {}).get(SOURCE_HASH_PROPERTY) == content_hash:
+                    with results_lock:
+                        reserved_count -= 1
+                        results["skipped"].append({"name": doc_name, "reason": "content unchanged"})
+                    return
+                app_properties = {SOURCE_HASH_PROPERTY: content_hash}
+
+                # Upload straight from memory; small files go up in a single multipart request
+                if len(data) > RESUMABLE_UPLOAD_THRESHOLD:
+                    chunksize = LARGE_UPLOAD_CHUNK_SIZE if len(data) > LARGE_UPLOAD_THRESHOLD else UPLOAD_CHUNK_SIZE
+                    media = MediaIoBaseUpload(io.BytesIO(data), mimetype='text/plain', resumable=True, chunksize=chunksize)
+                else:
+                    media = MediaIoBaseUpload(io.BytesIO(data), mimetype='text/plain', resumable=False)
+
+                # Retry logic for rate limiting
+                max_retries = 3
+                for attempt in range(max_retries):
+                    try:
+                        write_limiter.wait()
+                        if existing_doc:
+                            # Replace the content in place - the doc keeps its ID and links
+                            request = gdrive_service.files().update(
+                                fileId=existing_doc['id'],
+                                body={'appProperties': app_properties},
+                                media_body=media,
+                                fields='id, name, modifiedTime, appProperties, webViewLink'
+                            )
+                        else:
+                            # Create Google Doc with the content
+                            file_metadata = {
+                                'name': doc_name,
+                                'mimeType': 'application/vnd.google-apps.document',
+                                'parents': [folder_id],
+                                'appProperties': app_properties
+                            }
+                            request = gdrive_service.files().create(
+                                body=file_metadata,
+                                media_body=media,
+                                fields='id, name, modifiedTime, appProperties, webViewLink'
+                            )
+                        uploaded_file = request.execute(http=http)
+                        break
+                    except Exception as api_error:
+                        if attempt < max_retries - 1 and ('500' in str(api_error) or '503' in str(api_error) or 'rate' in str(api_error).lower()):
+                            print(f"⏳ Rate limited, waiting 5 seconds...")
+                            time.sleep(5)
+                        else:
+                            raise api_error
+            except Exception:
+                with results_lock:
+                    reserved_count -= 1
+                raise
+
+            with results_lock:
+                # Later source dirs mapping to this folder should find the new doc
+                existing_docs[doc_name] = uploaded_file
+                converted_count += 1
+                entry = {
+                    "name": doc_name,
+                    "source": str(txt_file),
+                    "link": uploaded_file.get('webViewLink')
+                }
+                if existing_doc:
+                    results["updated"].append(entry)
+                    print(f"✓ Updated: {doc_name} ({converted_count}/{limit if limit > 0 else '∞'})")
+                else:
+                    results["converted"].append(entry)
+                    print(f"✓ Converted: {doc_name} ({converted_count}/{limit if limit > 0 else '∞'})")
+
         except Exception as e:
-            print(f"⚠ Error listing docs in folder: {e}")
-        return existing
+            with results_lock:
+                results["errors"].append({
+                    "file": str(txt_file),
+                    "error": str(e)
+                })
+            print(f"✗ Error converting {txt_file}: {e}")
+
+    results_lock = threading.Lock()
+    folder_lock = threading.Lock()  # One thread at a time creates folders, so none are made twice
+    reserved_count = 0  # Finished plus in-flight uploads, checked against the limit
+    write_limiter = _RateLimiter(UPLOAD_RATE)
+
+    # One sweep of the target tree replaces a folder search and a doc listing per folder.
+    # Anything missing from it gets created, so a partial listing would duplicate the tree
+    try:
+        fetch_target_subtree()
+    except Exception as e:
+        return {"error": f"Could not list target folder: {e}"}
 
     # Process each source directory
     for dir_path in source_dirs:
@@ -420,118 +900,18 @@ def convert_txt_to_gdocs(gdrive_service, source_dirs: List[str], target_folder_i
             continue
 
         # Find all .txt files
-        txt_files = list(source_root.rglob('*.txt')) + list(source_root.rglob('*.TXT'))
+        # Every directory is converted, including ones the context scan skips
+        txt_files = list(_iter_txt_files(source_root, skip_dirs=()))
         print(f"📂 Found {len(txt_files)} .txt files in {dir_path}")
 
-        # Group files by target folder for efficient batch checking
-        files_by_folder = {}
-        for txt_file in txt_files:
-            target_id = get_target_folder_id(txt_file, source_root)
-            if target_id not in files_by_folder:
-                files_by_folder[target_id] = []
-            files_by_folder[target_id].append(txt_file)
-
-        # Process each folder group
-        for folder_id, files in files_by_folder.items():
-            if limit > 0 and converted_count >= limit:
-                results["limit_reached"] = True
-                break
-
-            existing_docs = get_existing_docs_in_folder(folder_id)
-
-            for txt_file in files:
-                # Check limit before processing each file
-                if limit > 0 and converted_count >= limit:
-                    results["limit_reached"] = True
-                    break
-                try:
-                    doc_name = txt_file.stem
-
-                    # Check if doc already exists and skip if so (no update needed)
-                    if doc_name in existing_docs:
-                        # Check if local file is newer than Google Doc
-                        existing_doc = existing_docs[doc_name]
-                        try:
-                            from datetime import timezone
-                            gdrive_time = datetime.fromisoformat(existing_doc['modifiedTime'].replace('Z', '+00:00'))
-                            # Get local file mtime as UTC for proper comparison
-                            local_time = datetime.fromtimestamp(txt_file.stat().st_mtime, tz=timezone.utc)
-                            if local_time <= gdrive_time:
-                                results["skipped"].append({"name": doc_name, "reason": "already up to date"})
-                                continue
-                        except (ValueError, KeyError, OSError) as e:
-                            print(f"⚠ Could not compare timestamps for {doc_name}, will update: {e}")
-
-                        # Delete old doc to replace with new content
-                        try:
-                            gdrive_service.files().delete(fileId=existing_doc['id']).execute()
-                        except Exception as e:
-                            print(f"⚠ Could not delete old doc {doc_name}: {e}")
-
-                    # Read the .txt file content
-                    with open(txt_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Create Google Doc with the content
-                    file_metadata = {
-                        'name': doc_name,
-                        'mimeType': 'application/vnd.google-apps.document',
-                        'parents': [folder_id]
-                    }
-
-                    # Write content to temp file for upload
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as tmp:
-                        tmp.write(content)
-                        tmp_path = tmp.name
+        if limit > 0 and converted_count >= limit:
+            results["limit_reached"] = True
+            continue
 
-                    try:
-                        media = MediaFileUpload(tmp_path, mimetype='text/plain', resumable=True)
-
-                        # Retry logic for rate limiting
-                        max_retries = 3
-                        for attempt in range(max_retries):
-                            try:
-                                created_file = gdrive_service.files().create(
-                                    body=file_metadata,
-                                    media_body=media,
-                                    fields='id, name, webViewLink'
-                                ).execute()
-                                break
-                            except Exception as api_error:
-                                if attempt < max_retries - 1 and ('500' in str(api_error) or '503' in str(api_error) or 'rate' in str(api_error).lower()):
-                                    print(f"⏳ Rate limited, waiting 5 seconds...")
-                                    time.sleep(5)
-                                else:
-                                    raise api_error
-
-                        if doc_name in existing_docs:
-                            results["updated"].append({
-                                "name": doc_name,
-                                "source": str(txt_file),
-                                "link": created_file.get('webViewLink')
-                            })
-                            converted_count += 1
-                            print(f"✓ Updated: {doc_name} ({converted_count}/{limit if limit > 0 else '∞'})")
-                        else:
-                            results["converted"].append({
-                                "name": doc_name,
-                                "source": str(txt_file),
-                                "link": created_file.get('webViewLink')
-                            })
-                            converted_count += 1
-                            print(f"✓ Converted: {doc_name} ({converted_count}/{limit if limit > 0 else '∞'})")
-
-                        # Small delay to avoid rate limiting
-                        time.sleep(0.5)
-                    finally:
-                        os.unlink(tmp_path)
-
-                except Exception as e:
-                    results["errors"].append({
-                        "file": str(txt_file),
-                        "error": str(e)
-                    })
-                    print(f"✗ Error converting {txt_file}: {e}")
+        # Uploads are round-trip bound, so run several at once under the shared write rate
+        jobs = [(txt_file, get_target_folder_path(txt_file, source_root)) for txt_file in txt_files]
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            list(executor.map(lambda job: upload_one(*job), jobs))
 
     return results
 
@@ -578,6 +958,16 @@ def main():
         default=0,
         help='Limit number of files to convert (useful for batch processing, 0=unlimited)'
     )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Poll for changes instead of using native file events (for network/FUSE mounts; auto-detected)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        help='Seconds between polls when polling (default: 2)'
+    )
     parser.add_argument(
         '--no-subfolders',
         action='store_true',
@@ -605,7 +995,7 @@ def main():
         print(f"   Target folder ID: {to_gdocs_folder_id}")
         print("🔗 Setting up Google Drive connection (with write access)...")
 
-        gdrive_service = setup_gdrive_service(
+        gdrive_service, gdrive_creds = setup_gdrive_service(
             config.get('gdrive_credentials_file', 'gdrive_credentials.json'),
             config.get('gdrive_token_file', 'gdrive_token.json'),
             write_access=True
@@ -619,7 +1009,10 @@ def main():
         if args.limit > 0:
             print(f"   Limit: {args.limit} files per batch")
         preserve_structure = not args.no_subfolders
-        results = convert_txt_to_gdocs(gdrive_service, monitored_dirs, to_gdocs_folder_id, preserve_structure=preserve_structure, limit=args.limit)
+        results = convert_txt_to_gdocs(gdrive_service, gdrive_creds, monitored_dirs, to_gdocs_folder_id, preserve_structure=preserve_structure, limit=args.limit)
+        if results.get('error'):
+            print(f"✗ {results['error']}")
+            sys.exit(1)
 
         # Print summary
         print(f"\n📊 Conversion Summary:")
@@ -638,10 +1031,10 @@ def main():
         return
 
     # Set up Google Drive if requested (read-only mode for monitoring)
-    gdrive_service = None
+    gdrive_service, gdrive_creds = None, None
     if gdrive_folder_id:
         print("🔗 Setting up Google Drive connection...")
-        gdrive_service = setup_gdrive_service(
+        gdrive_service, gdrive_creds = setup_gdrive_service(
             config.get('gdrive_credentials_file', 'gdrive_credentials.json'),
             config.get('gdrive_token_file', 'gdrive_token.json')
         )
@@ -649,7 +1042,7 @@ def main():
             print("✓ Google Drive connected")
     
     # Create handler
-    handler = TextFileHandler(output_file, monitored_dirs, gdrive_service, gdrive_folder_id)
+    handler = TextFileHandler(output_file, monitored_dirs, gdrive_service, gdrive_folder_id, gdrive_creds)
     
     # Initial update
     print("🔍 Scanning for .txt files...")
@@ -661,21 +1054,37 @@ def main():
             print(f"   Google Drive folder: {gdrive_folder_id}")
         print("   Press Ctrl+C to stop\n")
         
-        # Set up file watchers
-        observer = Observer()
+        # Set up file watchers - native events don't arrive from network/FUSE mounts, so poll those
+        poll_interval = args.poll_interval or config.get('poll_interval', 2.0)
+        use_polling = args.poll or config.get('poll', False)
+        if not use_polling:
+            mounts = _list_mounts()
+            network_dirs = [d for d in monitored_dirs if os.path.exists(d) and _is_network_path(d, mounts)]
+            if network_dirs:
+                print(f"ℹ Network filesystem detected ({', '.join(network_dirs)}), polling for changes")
+                use_polling = True
+        if use_polling:
+            observer = PollingObserver(timeout=poll_interval)
+            print(f"✓ Polling for changes every {poll_interval}s")
+        else:
+            observer = Observer()
         for monitored_dir in monitored_dirs:
-            dir_path = Path(monitored_dir)
+            dir_path = Path(monitored_dir).absolute()
             if dir_path.exists():
                 observer.schedule(handler, str(dir_path), recursive=True)
                 print(f"✓ Watching: {dir_path.resolve()}")
             else:
                 print(f"⚠ Directory not found: {dir_path}")
         
+        handler.start_worker()
         observer.start()
         
         # Set up periodic Google Drive check if enabled
-        last_gdrive_check = 0
-        gdrive_check_interval = config.get('gdrive_check_interval', 60)
+        # Idle polls back off exponentially up to the max interval; any change resets it
+        base_interval = config.get('gdrive_check_interval', 60)
+        max_interval = config.get('gdrive_max_check_interval', 600)
+        backoff_interval = base_interval
+        next_gdrive_check = time.time() + base_interval
         
         try:
             while True:
@@ -683,10 +1092,15 @@ def main():
                 # Periodic Google Drive check
                 if gdrive_service and gdrive_folder_id:
                     current_time = time.time()
-                    if current_time - last_gdrive_check >= gdrive_check_interval:
+                    if current_time >= next_gdrive_check:
                         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking Google Drive for updates...")
-                        handler.update_context()
-                        last_gdrive_check = current_time
+                        if handler.poll_gdrive():
+                            handler.update_context()
+                            backoff_interval = base_interval
+                        else:
+                            backoff_interval = min(backoff_interval * 2, max_interval)
+                        # Jitter so restarted watchers don't poll in lockstep, still never past the max interval
+                        next_gdrive_check = current_time + min(backoff_interval * random.uniform(0.8, 1.2), max_interval)
         except KeyboardInterrupt:
             print("\n\n🛑 Stopping file watcher...")
             observer.stop()